@@ -0,0 +1,48 @@
+"""
+pytest hooks for the unit tests.
+
+tests/test_unit.py runs standalone (`python tests/test_unit.py`) and is
+also collectable by pytest. Its GROUPS dict is the unit of isolation:
+tests in a group share fixtures and must run in order in one process.
+Marking each test with its group lets pytest-xdist keep a group on one
+worker:
+
+    pytest tests/test_unit.py -n auto --dist=loadgroup
+
+Collection also checks that importing test_unit pulled in no agent
+module, so `pytest --collect-only` stays free of agent start-up cost.
+"""
+import pytest
+
+
+def pytest_configure(config):
+    # pytest-xdist registers this marker itself; registering it here keeps
+    # plain `pytest` runs free of unknown-marker warnings.
+    config.addinivalue_line("markers", "xdist_group(name): run tests in the same group on one worker")
+
+
+# tryfirst: xdist reads xdist_group marks in its own modifyitems hook
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    group_of = {}
+    for item in items:
+        groups = getattr(item.module, "GROUPS", None)
+        if not groups:
+            continue
+        if item.module not in group_of:
+            group_of[item.module] = {fn.__name__: g for g, fns in groups.items() for fn in fns}
+        group = group_of[item.module].get(item.name)
+        if group:
+            item.add_marker(pytest.mark.xdist_group(group))
+
+
+def pytest_collection_finish(session):
+    # Same guard the standalone runner applies before running anything.
+    # The integration tests import agents at module scope, so the imports
+    # seen since test_unit loaded are only checked when nothing else was
+    # collected; otherwise just test_unit's own import is.
+    modules = {item.module for item in session.items}
+    for module in modules:
+        check = getattr(module, "_check_no_agents_imported", None)
+        if check:
+            check(since_load=len(modules) == 1)
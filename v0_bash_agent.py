@@ -78,6 +78,9 @@ TOOL = [{
     }
 }]
 
+# Names in TOOL; read by tests/test_unit.py, not by the agent
+TOOL_NAMES = frozenset(t["name"] for t in TOOL)
+
 # System prompt teaches the model HOW to use bash effectively
 # Notice the subagent guidance - this is how we get hierarchical task decomposition
 SYSTEM = f"""You are a CLI agent at {os.getcwd()}. Solve problems using bash commands.
@@ -65,8 +65,14 @@ load_dotenv(override=True)
 if os.getenv("ANTHROPIC_BASE_URL"):
     os.environ.pop("ANTHROPIC_AUTH_TOKEN", None)
 
+
+def resolve_model() -> str:
+    """Read the model ID from MODEL_ID, falling back to the default Claude model."""
+    return os.getenv("MODEL_ID", "claude-sonnet-4-5-20250929")
+
+
 WORKDIR = Path.cwd()
-MODEL = os.getenv("MODEL_ID", "claude-sonnet-4-5-20250929")
+MODEL = resolve_model()
 client = Anthropic(base_url=os.getenv("ANTHROPIC_BASE_URL"))
 
 
@@ -175,6 +181,9 @@ TOOLS = [
     },
 ]
 
+# Names in TOOLS; read by tests/test_unit.py, not by the agent
+TOOL_NAMES = frozenset(t["name"] for t in TOOLS)
+
 
 # =============================================================================
 # Tool Implementations
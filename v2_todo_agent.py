@@ -103,6 +103,8 @@ class TodoManager:
     This gives real-time visibility into what the agent is doing.
     """
 
+    VALID_STATUSES = frozenset({"pending", "in_progress", "completed"})
+
     def __init__(self):
         self.items = []
 
@@ -134,7 +136,7 @@ class TodoManager:
             # Validation checks
             if not content:
                 raise ValueError(f"Item {i}: content required")
-            if status not in ("pending", "in_progress", "completed"):
+            if status not in self.VALID_STATUSES:
                 raise ValueError(f"Item {i}: invalid status '{status}'")
             if not active_form:
                 raise ValueError(f"Item {i}: activeForm required")
@@ -188,6 +190,10 @@ class TodoManager:
 
         return "\n".join(lines)
 
+    def reset(self):
+        """Drop all items so one manager can be reused across sessions."""
+        self.items = []
+
 
 # Global todo manager instance
 TODO = TodoManager()
@@ -309,6 +315,9 @@ TOOLS = [
     },
 ]
 
+# Names in TOOLS; read by tests/test_unit.py, not by the agent
+TOOL_NAMES = frozenset(t["name"] for t in TOOLS)
+
 
 # =============================================================================
 # Tool Implementations (v1 + TodoWrite)
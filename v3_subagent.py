@@ -332,6 +332,9 @@ Example uses:
 # Main agent gets all tools including Task
 ALL_TOOLS = BASE_TOOLS + [TASK_TOOL]
 
+# Names in ALL_TOOLS; read by tests/test_unit.py, not by the agent
+TOOL_NAMES = frozenset(t["name"] for t in ALL_TOOLS)
+
 
 def get_tools_for_agent(agent_type: str) -> list:
     """
@@ -497,6 +497,9 @@ detailed instructions and access to resources.""",
 
 ALL_TOOLS = BASE_TOOLS + [TASK_TOOL, SKILL_TOOL]
 
+# Names in ALL_TOOLS; read by tests/test_unit.py, not by the agent
+TOOL_NAMES = frozenset(t["name"] for t in ALL_TOOLS)
+
 
 def get_tools_for_agent(agent_type: str) -> list:
     """Filter tools based on agent type."""
@@ -273,6 +273,19 @@ class TaskManager:
             return True
         return False
 
+    def reset(self):
+        """Delete every task file and restart IDs at 1, keeping the directory."""
+        with self._lock:
+            for path in self.tasks_dir.glob("task_*.json"):
+                path.unlink()
+            (self.tasks_dir / HIGHWATERMARK_FILE).unlink(missing_ok=True)
+            self._counter = 1
+
+    def reload_from_disk(self):
+        """Re-sync in-memory state with .tasks/ after another process wrote to it."""
+        with self._lock:
+            self._counter = self._load_counter()
+
 
 TASK_MGR = TaskManager()
 
@@ -653,6 +666,9 @@ if TASKS_ENABLED:
 else:
     ALL_TOOLS = BASE_TOOLS + [TODO_TOOL, SUBAGENT_TOOL, SKILL_TOOL]
 
+# Names in ALL_TOOLS; read by tests/test_unit.py, not by the agent
+TOOL_NAMES = frozenset(t["name"] for t in ALL_TOOLS)
+
 
 def get_tools_for_agent(agent_type: str) -> list:
     allowed = AGENT_TYPES.get(agent_type, {}).get("tools", "*")
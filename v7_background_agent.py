@@ -184,8 +184,9 @@ class BackgroundManager:
             finally:
                 # Write output to persistent file
                 output_path = self._write_output(task_id, bg_task.output)
-                bg_task.event.set()
-                # lB (notification path): push to queue for main loop to drain
+                # lB (notification path): push to queue for main loop to drain.
+                # Queued before the event fires, so a caller that saw the task
+                # finish via get_output() will find its notification in the queue.
                 self._notifications.put({
                     "task_id": task_id,
                     "task_type": bg_task.task_type,
@@ -193,6 +194,7 @@ class BackgroundManager:
                     "summary": bg_task.output[:500],
                     "output_file": str(output_path),
                 })
+                bg_task.event.set()
 
         thread = threading.Thread(target=wrapper, daemon=True)
         bg_task.thread = thread
@@ -214,7 +216,9 @@ class BackgroundManager:
         if not bg_task:
             return {"error": f"Task {task_id} not found"}
 
-        if block and bg_task.status == "running":
+        # The event, not status, marks the end of the wrapper: status flips to
+        # "completed" before the output file and notification are written.
+        if block:
             bg_task.event.wait(timeout=timeout / 1000)
 
         return {
@@ -247,6 +251,17 @@ class BackgroundManager:
                 break
         return notifications
 
+    def clear(self):
+        """
+        Forget all tracked tasks and drop pending notifications.
+
+        Tasks that are still running keep their thread and will still post
+        a notification when they finish.
+        """
+        with self._lock:
+            self._tasks.clear()
+        self.drain_notifications()
+
 
 BG = BackgroundManager()
 
@@ -703,6 +718,9 @@ ALL_TOOLS = BASE_TOOLS + [
     TASK_OUTPUT_TOOL, TASK_STOP_TOOL,
 ]
 
+# Names in ALL_TOOLS; read by tests/test_unit.py, not by the agent
+TOOL_NAMES = frozenset(t["name"] for t in ALL_TOOLS)
+
 
 def get_tools_for_agent(agent_type: str) -> list:
     """Get tools for a one-shot subagent based on its type."""
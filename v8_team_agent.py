@@ -361,6 +361,16 @@ class TeammateManager:
                 lines.append(f"Team '{tname}': {members or 'empty'}")
             return "\n".join(lines)
 
+    def clear(self):
+        """
+        Forget all teams without messaging their members.
+
+        Team directories stay on disk, and teammates that are already
+        running keep their thread.
+        """
+        with self._lock:
+            self._teams.clear()
+
     def _find_teammate(self, name: str, team_name: str = None) -> Teammate:
         if team_name and team_name in self._teams:
             return self._teams[team_name].get(name)
@@ -500,12 +510,14 @@ class BackgroundManager:
                 bg_task.output = f"Error: {e}"
                 bg_task.status = "error"
             finally:
-                bg_task.event.set()
+                # Queued before the event fires, so a caller that saw the task
+                # finish via get_output() will find its notification in the queue.
                 self._notifications.put({
                     "task_id": task_id,
                     "status": bg_task.status,
                     "summary": bg_task.output[:500],
                 })
+                bg_task.event.set()
 
         thread = threading.Thread(target=wrapper, daemon=True)
         bg_task.thread = thread
@@ -527,7 +539,9 @@ class BackgroundManager:
         if not bg_task:
             return {"error": f"Task {task_id} not found"}
 
-        if block and bg_task.status == "running":
+        # The event, not status, marks the end of the wrapper: status flips to
+        # "completed" before the notification is queued.
+        if block:
             bg_task.event.wait(timeout=timeout / 1000)
 
         return {
@@ -1053,6 +1067,9 @@ ALL_TOOLS = BASE_TOOLS + [
     TEAM_CREATE_TOOL, SEND_MESSAGE_TOOL, TEAM_DELETE_TOOL,
 ]
 
+# Names in ALL_TOOLS; read by tests/test_unit.py, not by the agent
+TOOL_NAMES = frozenset(t["name"] for t in ALL_TOOLS)
+
 
 def get_tools_for_agent(agent_type: str) -> list:
     """Get tools for a one-shot subagent based on its type."""
@@ -603,12 +603,14 @@ class BackgroundManager:
                 bg_task.output = f"Error: {e}"
                 bg_task.status = "error"
             finally:
-                bg_task.event.set()
+                # Queued before the event fires, so a caller that saw the task
+                # finish via get_output() will find its notification in the queue.
                 self._notifications.put({
                     "task_id": task_id,
                     "status": bg_task.status,
                     "summary": bg_task.output[:500],
                 })
+                bg_task.event.set()
 
         thread = threading.Thread(target=wrapper, daemon=True)
         bg_task.thread = thread
@@ -630,7 +632,9 @@ class BackgroundManager:
         if not bg_task:
             return {"error": f"Task {task_id} not found"}
 
-        if block and bg_task.status == "running":
+        # The event, not status, marks the end of the wrapper: status flips to
+        # "completed" before the notification is queued.
+        if block:
             bg_task.event.wait(timeout=timeout / 1000)
 
         return {
@@ -1157,6 +1161,9 @@ ALL_TOOLS = BASE_TOOLS + [
     TEAM_CREATE_TOOL, SEND_MESSAGE_TOOL, TEAM_DELETE_TOOL,
 ]
 
+# Names in ALL_TOOLS; read by tests/test_unit.py, not by the agent
+TOOL_NAMES = frozenset(t["name"] for t in ALL_TOOLS)
+
 
 def get_tools_for_agent(agent_type: str) -> list:
     """Get tools for a one-shot subagent based on its type."""